@@ -0,0 +1,60 @@
+"""JSON encoding and decoding that uses orjson when it is installed."""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the standard library
+    orjson = None
+
+# Runs of 19+ digits may be integers outside orjson's 64-bit range, which it
+# silently turns into floats; documents containing one are left to json.loads.
+# Mapping every digit to '0' and everything else to ' ' lets bytes.translate
+# and a substring search find such runs in C.
+_DIGIT_MASK = bytes(ord('0') if ord('0') <= c <= ord('9') else ord(' ') for c in range(256))
+_WIDE_NUMBER = b'0' * 19
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Decode a JSON document.
+
+    Input orjson rejects but the standard library accepts (e.g. NaN/Infinity)
+    is retried with json.loads, so both paths accept the same documents and
+    raise the same errors. Documents with 19 or more consecutive digits go
+    straight to json.loads, which keeps integers wider than 64 bits exact
+    where orjson would return a float.
+
+    Args:
+        data: JSON text as str or UTF-8 bytes
+
+    Returns:
+        The decoded value
+    """
+    if orjson is not None:
+        raw = data.encode('utf-8', 'surrogatepass') if isinstance(data, str) else data
+        if _WIDE_NUMBER not in raw.translate(_DIGIT_MASK):
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode a value as compact UTF-8 JSON.
+
+    Args:
+        obj: The value to encode
+
+    Returns:
+        JSON document as bytes
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # Includes lone surrogates, e.g. undecodable file names from os.scandir
+            pass
+    # ASCII output escapes lone surrogates instead of failing to encode them
+    return json.dumps(obj, separators=(',', ':')).encode('ascii')
@@ -1,12 +1,150 @@
 """File parser for extracting structure from markdown, JSON, YAML, and Mermaid files."""
 
 import json
+import os
 import re
+import stat
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
+from . import fastjson
+
+# Markdown ATX header lines (# to ######), matched across the whole document;
+# surrounding spaces and tabs are ignored and blank titles don't count
+_HEADER_RE = re.compile(r'(?m)^[ \t]*(#{1,6})[ \t]+(.*?\S)[ \t]*$')
+
+# Files up to this size are read with a single os.read call
+SINGLE_READ_LIMIT = 1024 * 1024
+
+# Arrays of more than this many primitive values are summarized in the tree,
+# keeping only the first PRIMITIVE_ARRAY_SAMPLE elements as children
+PRIMITIVE_ARRAY_SUMMARY_MIN = 64
+PRIMITIVE_ARRAY_SAMPLE = 20
+
+# Tree node type names for the exact scalar types json and yaml produce
+_PRIMITIVE_TYPE_NAMES = {
+    type(None): 'null',
+    bool: 'boolean',
+    int: 'number',
+    float: 'number',
+    str: 'string',
+}
+
+
+def _primitive_node(value: Any, key: Optional[str]) -> Dict[str, Any]:
+    """Build the tree node for a primitive JSON/YAML value.
+
+    Args:
+        value: The primitive value
+        key: Key or index label for the value, if any
+
+    Returns:
+        Tree node for the value
+    """
+    type_name = _PRIMITIVE_TYPE_NAMES.get(type(value))
+    if type_name is None:
+        # Subclasses and other scalars, such as YAML dates
+        if isinstance(value, bool):
+            type_name = 'boolean'
+        elif isinstance(value, (int, float)):
+            type_name = 'number'
+        else:
+            type_name = 'string'
+
+    return {
+        'label': key if key else str(value),
+        'type': type_name,
+        'children': []
+    }
+
+
+def _summarize_primitive_array(node: Dict[str, Any], length: int) -> None:
+    """Collapse an array node of primitives to a sample plus a placeholder.
+
+    Args:
+        node: Array node whose children are all primitive values
+        length: Number of elements in the array
+    """
+    node['type'] = f'array[{length}] primitives'
+    del node['children'][PRIMITIVE_ARRAY_SAMPLE:]
+    node['children'].append({
+        'label': f'…({length - PRIMITIVE_ARRAY_SAMPLE} more)',
+        'children': []
+    })
+
+
+def _key_label(key: Any) -> Any:
+    """Return the tree label for a mapping key.
+
+    YAML allows keys JSON can't encode, such as dates and timestamps; they
+    are labelled with their str() text (e.g. '2024-01-15'), so the tree
+    encodes the same way with or without orjson. JSON scalar keys are kept.
+    """
+    return key if type(key) in _PRIMITIVE_TYPE_NAMES else str(key)
+
+
+def _handle_dict(value: Dict, key: Any, parent: List, stack: List) -> None:
+    """Add an object node (or, without a key, its items) to the tree."""
+    if key:
+        # This is a nested object
+        node = {
+            'label': key,
+            'type': 'object',
+            'children': []
+        }
+        parent.append(node)
+        parent = node['children']
+    # Root level object: its items go straight into the parent
+    for k, v in reversed(value.items()):
+        stack.append((v, _key_label(k), parent))
+
+
+def _handle_list(value: List, key: Any, parent: List, stack: List) -> None:
+    """Add an array node to the tree and queue its elements."""
+    node = {
+        'label': key if key else 'Root Array',
+        'type': f'array[{len(value)}]',
+        'children': []
+    }
+    parent.append(node)
+    children = node['children']
+
+    count = len(value)
+    if count > PRIMITIVE_ARRAY_SUMMARY_MIN and not any(
+        isinstance(item, (dict, list)) for item in value
+    ):
+        # Only the sampled elements get nodes
+        for i in range(PRIMITIVE_ARRAY_SAMPLE):
+            children.append(_primitive_node(value[i], f'[{i}]'))
+        _summarize_primitive_array(node, count)
+    else:
+        for i in range(count - 1, -1, -1):
+            stack.append((value[i], f'[{i}]', children))
+
+
+def _handle_primitive(value: Any, key: Any, parent: List, stack: List) -> None:
+    """Add a leaf node for a primitive value to the tree."""
+    parent.append(_primitive_node(value, key))
+
+
+# Stack marker _build_json_tree pushes below a container's children
+_END_CONTAINER = object()
+
+# _build_json_tree handlers by exact type; a dict lookup on type(value) skips
+# the isinstance chain for the types json and yaml actually produce
+_TREE_HANDLERS = {
+    dict: _handle_dict,
+    list: _handle_list,
+    **{t: _handle_primitive for t in _PRIMITIVE_TYPE_NAMES},
+}
+
 
 class FileParser:
     """Parses files and extracts their structure."""
@@ -19,6 +157,7 @@ class FileParser:
         """
         self.file_path = Path(file_path)
         self.extension = self.file_path.suffix.lower()
+        self._content: Optional[str] = None
 
     def parse(self) -> List[Dict[str, Any]]:
         """Parse the file and return its structure.
@@ -40,14 +179,44 @@ class FileParser:
     def get_raw_content(self) -> str:
         """Get the raw content of the file.
 
+        The file is read once per parser; later calls return the same string.
+
         Returns:
             Raw file content as string
         """
+        if self._content is None:
+            try:
+                self._content = self._read_file()
+            except Exception as e:
+                self._content = f"Error reading file: {str(e)}"
+        return self._content
+
+    def _read_file(self) -> str:
+        """Read and decode the file.
+
+        Regular files up to SINGLE_READ_LIMIT are read with one os.read of
+        their known size, skipping the buffered text-IO layers; anything else
+        uses the regular text reader. Line endings are normalized to '\\n' either way.
+
+        Returns:
+            File content as string
+        """
+        fd = os.open(self.file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except Exception as e:
-            return f"Error reading file: {str(e)}"
+            info = os.fstat(fd)
+            size = info.st_size
+            small = stat.S_ISREG(info.st_mode) and size <= SINGLE_READ_LIMIT
+            data = os.read(fd, size) if small else None
+        finally:
+            os.close(fd)
+
+        if data is None or len(data) < size:
+            return self.file_path.read_text(encoding='utf-8')
+
+        text = data.decode('utf-8')
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text
 
     def _parse_markdown(self) -> List[Dict[str, Any]]:
         """Parse markdown file and extract headers.
@@ -59,32 +228,30 @@ class FileParser:
         nodes = []
         header_stack = []
 
-        for line in content.split('\n'):
-            # Match markdown headers (# to ######)
-            match = re.match(r'^(#{1,6})\s+(.+)$', line.strip())
-            if match:
-                level = len(match.group(1))
-                title = match.group(2).strip()
-
-                # Remove headers from stack that are same level or deeper
-                while header_stack and header_stack[-1]['level'] >= level:
-                    header_stack.pop()
-
-                node = {
-                    'label': title,
-                    'type': f'h{level}',
-                    'level': level,
-                    'children': []
-                }
+        # Scan the whole text in C; non-header lines never become Python strings
+        for match in _HEADER_RE.finditer(content):
+            level = len(match.group(1))
+            title = match.group(2)
 
-                if header_stack:
-                    # Add as child to parent
-                    header_stack[-1]['children'].append(node)
-                else:
-                    # Top-level header
-                    nodes.append(node)
+            # Remove headers from stack that are same level or deeper
+            while header_stack and header_stack[-1]['level'] >= level:
+                header_stack.pop()
 
-                header_stack.append(node)
+            node = {
+                'label': title,
+                'type': f'h{level}',
+                'level': level,
+                'children': []
+            }
+
+            if header_stack:
+                # Add as child to parent
+                header_stack[-1]['children'].append(node)
+            else:
+                # Top-level header
+                nodes.append(node)
+
+            header_stack.append(node)
 
         return nodes
 
@@ -96,7 +263,7 @@ class FileParser:
         """
         try:
             content = self.get_raw_content()
-            data = json.loads(content)
+            data = fastjson.loads(content)
             return self._build_json_tree(data)
         except json.JSONDecodeError as e:
             return [{'label': f'JSON Parse Error: {str(e)}', 'children': []}]
@@ -111,7 +278,7 @@ class FileParser:
         """
         try:
             content = self.get_raw_content()
-            data = yaml.safe_load(content)
+            data = yaml.load(content, Loader=_YamlLoader)
             return self._build_json_tree(data)  # Same structure as JSON
         except yaml.YAMLError as e:
             return [{'label': f'YAML Parse Error: {str(e)}', 'children': []}]
@@ -172,63 +339,51 @@ class FileParser:
     def _build_json_tree(self, data: Any, key: str = None) -> List[Dict[str, Any]]:
         """Build tree structure from JSON/YAML data.
 
+        Uses an explicit stack instead of recursion, appending each node
+        straight into its parent's children list.
+
         Args:
             data: The data to build tree from
             key: Optional key name for this node
 
         Returns:
             List of tree nodes
+
+        Raises:
+            RecursionError: If a container contains itself, as a YAML alias
+                can make it; the parse methods report it as an error node
         """
-        if isinstance(data, dict):
-            if key:
-                # This is a nested object
-                children = []
-                for k, v in data.items():
-                    children.extend(self._build_json_tree(v, k))
-                return [{
-                    'label': key,
-                    'type': 'object',
-                    'children': children
-                }]
-            else:
-                # Root level object
-                nodes = []
-                for k, v in data.items():
-                    nodes.extend(self._build_json_tree(v, k))
-                return nodes
-
-        elif isinstance(data, list):
-            children = []
-            for i, item in enumerate(data):
-                children.extend(self._build_json_tree(item, f'[{i}]'))
-
-            if key:
-                return [{
-                    'label': key,
-                    'type': f'array[{len(data)}]',
-                    'children': children
-                }]
-            else:
-                return [{
-                    'label': 'Root Array',
-                    'type': f'array[{len(data)}]',
-                    'children': children
-                }]
+        nodes = []
+        # Each frame is (value, key, children list its node is appended to);
+        # frames are pushed in reverse so siblings come out in document order
+        stack = [(data, key, nodes)]
+        # ids of the containers being expanded on the current path; an
+        # _END_CONTAINER frame below each container's children removes it again
+        path = set()
+
+        while stack:
+            value, key, parent = stack.pop()
+            if value is _END_CONTAINER:
+                path.discard(key)
+                continue
+
+            handler = _TREE_HANDLERS.get(type(value))
+            if handler is None:
+                # Subclasses of dict/list and other scalars
+                if isinstance(value, dict):
+                    handler = _handle_dict
+                elif isinstance(value, list):
+                    handler = _handle_list
+                else:
+                    handler = _handle_primitive
 
-        else:
-            # Primitive value
-            type_name = type(data).__name__
-            if data is None:
-                type_name = 'null'
-            elif isinstance(data, bool):
-                type_name = 'boolean'
-            elif isinstance(data, (int, float)):
-                type_name = 'number'
-            else:
-                type_name = 'string'
+            if handler is not _handle_primitive:
+                # A YAML alias can make a container its own descendant
+                container_id = id(value)
+                if container_id in path:
+                    raise RecursionError('maximum recursion depth exceeded (self-referencing value)')
+                path.add(container_id)
+                stack.append((_END_CONTAINER, container_id, None))
+            handler(value, key, parent, stack)
 
-            return [{
-                'label': key if key else str(data),
-                'type': type_name,
-                'children': []
-            }]
+        return nodes
@@ -1,10 +1,35 @@
 """Project management for organizing watched folders."""
 
-import json
+import os
 import re
 import secrets
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
+
+from . import fastjson
+
+# Seconds to wait before writing the config, so bursts of edits share one write
+SAVE_DELAY = 0.2
+
+
+class _SlugFilter(dict):
+    """str.translate table that drops everything except [a-z0-9\\s-].
+
+    Entries are filled in on first use, so any code point can be looked up
+    without building a table for the whole of Unicode.
+    """
+
+    def __missing__(self, code_point: int) -> Optional[int]:
+        char = chr(code_point)
+        keep = ('a' <= char <= 'z') or ('0' <= char <= '9') or char == '-' or char.isspace()
+        value = code_point if keep else None
+        self[code_point] = value
+        return value
+
+
+_SLUG_FILTER = _SlugFilter()
+_SLUG_SEPARATOR_RE = re.compile(r'[\s-]+')
 
 
 def slugify(text: str) -> str:
@@ -16,12 +41,10 @@ def slugify(text: str) -> str:
     Returns:
         URL-friendly slug
     """
-    # Convert to lowercase and replace spaces with hyphens
-    slug = text.lower().strip()
-    # Remove special characters except hyphens
-    slug = re.sub(r'[^a-z0-9\s-]', '', slug)
+    # Convert to lowercase and drop special characters except hyphens
+    slug = text.lower().strip().translate(_SLUG_FILTER)
     # Replace multiple spaces/hyphens with single hyphen
-    slug = re.sub(r'[\s-]+', '-', slug)
+    slug = _SLUG_SEPARATOR_RE.sub('-', slug)
     # Remove leading/trailing hyphens
     slug = slug.strip('-')
     return slug or generate_project_id()
@@ -106,22 +129,35 @@ class ProjectManager:
         """
         self.config_file = config_file
         self.projects: Dict[str, Project] = {}
+        self._paths: Set[str] = set()
+        self._by_slug: Dict[str, Project] = {}
+        self._by_identifier: Dict[str, Project] = {}
+        # Read-only snapshots for listing endpoints; every change resets them
+        # and bumps the generation, so a snapshot built while a change was
+        # being made is never published
+        self._all_projects: Optional[Tuple[Project, ...]] = None
+        self._project_dicts: Optional[Tuple[Dict, ...]] = None
+        self._snapshot_generation = 0
+        self._snapshot_lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._save_timer: Optional[threading.Timer] = None
         self.load()
 
     def load(self) -> None:
         """Load projects from config file."""
         if self.config_file.exists():
-            with open(self.config_file, 'r') as f:
-                data = json.load(f)
-
-                # Handle old format (list of paths)
-                if isinstance(data, list):
-                    self._migrate_from_old_format(data)
-                else:
-                    # New format (dict of projects)
-                    for project_data in data.get('projects', []):
-                        project = Project.from_dict(project_data)
-                        self.projects[project.project_id] = project
+            data = fastjson.loads(self.config_file.read_bytes())
+
+            # Handle old format (list of paths)
+            if isinstance(data, list):
+                self._migrate_from_old_format(data)
+            else:
+                # New format (dict of projects)
+                for project_data in data.get('projects', []):
+                    project = Project.from_dict(project_data)
+                    self.projects[project.project_id] = project
+
+            self._rebuild_indexes()
 
     def _migrate_from_old_format(self, paths: List[str]) -> None:
         """Migrate from old format (list of paths) to new format.
@@ -138,14 +174,67 @@ class ProjectManager:
             self.projects[project.project_id] = project
         self.save()
 
+    def _rebuild_indexes(self) -> None:
+        """Rebuild the path and slug lookups from the current projects."""
+        self._paths = {os.path.normpath(p.path) for p in self.projects.values()}
+
+        # The first project with a given slug wins, as with a linear scan
+        self._by_slug = {}
+        for project in self.projects.values():
+            self._by_slug.setdefault(project.slug, project)
+
+        # IDs take precedence over a slug that happens to equal another ID
+        self._by_identifier = {**self._by_slug, **self.projects}
+
+        self._invalidate_snapshots()
+
+    def _invalidate_snapshots(self) -> None:
+        """Drop the cached project snapshots after a change."""
+        with self._snapshot_lock:
+            self._snapshot_generation += 1
+            self._all_projects = None
+            self._project_dicts = None
+
     def save(self) -> None:
-        """Save projects to config file."""
-        self.config_file.parent.mkdir(parents=True, exist_ok=True)
-        data = {
-            'projects': [p.to_dict() for p in self.projects.values()]
-        }
-        with open(self.config_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        """Save projects to config file.
+
+        The file is written to a temporary sibling first and then renamed over
+        the config, so readers never see a partially written file.
+        """
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+
+            self.config_file.parent.mkdir(parents=True, exist_ok=True)
+            # Serialized from the live projects, not the shared snapshots
+            data = {
+                'projects': [p.to_dict() for p in tuple(self.projects.values())]
+            }
+            tmp_file = self.config_file.with_suffix('.tmp')
+            tmp_file.write_bytes(fastjson.dumps(data))
+            os.replace(tmp_file, self.config_file)
+
+    def _schedule_save(self) -> None:
+        """Save shortly, coalescing changes made in quick succession."""
+        with self._save_lock:
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(SAVE_DELAY, self._save_in_background)
+                self._save_timer.start()
+
+    def _save_in_background(self) -> None:
+        """Run a scheduled save, reporting failures since no caller sees them."""
+        try:
+            self.save()
+        except Exception as e:
+            print(f"Error: Could not save projects to {self.config_file}: {e}")
+
+    def flush(self) -> None:
+        """Write a scheduled save now instead of waiting for its timer."""
+        with self._save_lock:
+            pending = self._save_timer is not None
+        if pending:
+            self.save()
 
     def add_project(
         self,
@@ -165,7 +254,8 @@ class ProjectManager:
         """
         project = Project(path=path, title=title, description=description)
         self.projects[project.project_id] = project
-        self.save()
+        self._rebuild_indexes()
+        self._schedule_save()
         return project
 
     def update_project(
@@ -197,8 +287,12 @@ class ProjectManager:
             project.description = description
         if path is not None:
             project.path = path
+        if title is not None or path is not None:
+            self._rebuild_indexes()
+        else:
+            self._invalidate_snapshots()
 
-        self.save()
+        self._schedule_save()
         return project
 
     def remove_project(self, project_id: str) -> bool:
@@ -212,7 +306,8 @@ class ProjectManager:
         """
         if project_id in self.projects:
             del self.projects[project_id]
-            self.save()
+            self._rebuild_indexes()
+            self._schedule_save()
             return True
         return False
 
@@ -236,15 +331,72 @@ class ProjectManager:
         Returns:
             Project or None if not found
         """
-        for project in self.projects.values():
-            if project.slug == slug:
-                return project
-        return None
+        return self._by_slug.get(slug)
+
+    def get_project_any(self, identifier: str) -> Optional[Project]:
+        """Get a project by ID or, failing that, by slug.
+
+        Args:
+            identifier: A project ID or slug
+
+        Returns:
+            Project or None if not found
+        """
+        return self._by_identifier.get(identifier)
+
+    def is_watched(self, path: str) -> bool:
+        """Check whether a path is inside one of the projects.
 
-    def get_all_projects(self) -> List[Project]:
+        Walks up the path's parent directories, so the cost depends on the
+        depth of the path rather than on the number of projects.
+
+        Args:
+            path: Absolute file or folder path
+
+        Returns:
+            True if the path is a project folder or lies inside one
+        """
+        current = os.path.normpath(path)
+        while True:
+            if current in self._paths:
+                return True
+            parent = os.path.dirname(current)
+            if parent == current:
+                return False
+            current = parent
+
+    def get_all_projects(self) -> Tuple[Project, ...]:
         """Get all projects.
 
+        The tuple is built once and shared until the projects change.
+
+        Returns:
+            Tuple of all projects
+        """
+        with self._snapshot_lock:
+            snapshot = self._all_projects
+            generation = self._snapshot_generation
+        if snapshot is None:
+            snapshot = tuple(self.projects.values())
+            with self._snapshot_lock:
+                if generation == self._snapshot_generation:
+                    self._all_projects = snapshot
+        return snapshot
+
+    def get_project_dicts(self) -> Tuple[Dict, ...]:
+        """Get all projects as dictionaries, as returned by the API.
+
+        The tuple is built once and shared until the projects change.
+
         Returns:
-            List of all projects
+            Tuple of project dictionaries
         """
-        return list(self.projects.values())
+        with self._snapshot_lock:
+            snapshot = self._project_dicts
+            generation = self._snapshot_generation
+        if snapshot is None:
+            snapshot = tuple(p.to_dict() for p in self.get_all_projects())
+            with self._snapshot_lock:
+                if generation == self._snapshot_generation:
+                    self._project_dicts = snapshot
+        return snapshot
@@ -1,36 +1,147 @@
 """Main Flask application server."""
 
+import gzip
 import os
 import socket
-import json
-import queue
+import sys
+import threading
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from operator import attrgetter, itemgetter
 from pathlib import Path
+from typing import Any, Collection, Dict, Iterable, Iterator, List
 
 import markdown
-from flask import Flask, jsonify, send_from_directory, Response, stream_with_context
+from flask import Flask, jsonify, request, send_from_directory, Response, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 
-from .watcher import FolderWatcher
+try:
+    import cmarkgfm
+    from cmarkgfm.cmark import Options as cmarkgfmOptions
+except ImportError:  # Optional: C markdown renderer
+    cmarkgfm = None
+
+from . import fastjson
+from .watcher import FolderWatcher, stop_observer
 from .file_parser import FileParser
 from .project import ProjectManager
 
+
+class FastJSONProvider(DefaultJSONProvider):
+    """jsonify() provider that encodes with fastjson (orjson when installed).
+
+    Keys keep their insertion order, as sort_keys is off. If sort_keys is
+    turned back on, or output is indented (debug mode), Flask's own encoder
+    is used. With orjson, dates are written as ISO 8601 rather than as HTTP
+    dates.
+    """
+
+    sort_keys = False
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs.get('indent') is None and not kwargs.get('sort_keys', self.sort_keys):
+            try:
+                return fastjson.dumps(obj).decode('utf-8')
+            except TypeError:
+                # Types only Flask's encoder knows, e.g. Decimal
+                pass
+        return super().dumps(obj, **kwargs)
+
+
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 CORS(app)  # Enable CORS for development
 app.config['project_manager'] = None
 app.config['watchers'] = {}
 app.config['config_file'] = Path.home() / '.fileviewer' / 'projects.json'
-app.config['change_queues'] = []  # List of queues for SSE clients
-
-
-def find_free_port(start_port: int = 6060, max_attempts: int = 100) -> int:
-    """Find a free port starting from start_port."""
-    for port in range(start_port, start_port + max_attempts):
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+app.config['change_queues'] = {}  # id -> (buffer, wakeup event) per SSE client
+app.config['file_cache'] = OrderedDict()  # path -> ((mtime_ns, size), parse_file result)
+
+# Limits for app.config['file_cache']: number of parsed files, and total size
+# of their encoded response bodies (the tree, content and HTML kept alongside
+# take roughly as much again). Files that are streamed are never cached.
+FILE_CACHE_SIZE = 256
+FILE_CACHE_BYTES = 64 * 1024 * 1024
+_file_cache_bytes = 0
+_file_cache_lock = threading.Lock()
+
+# Pending messages kept per SSE client; older ones are dropped when it fills
+SSE_BUFFER_SIZE = 64
+_change_queues_lock = threading.Lock()
+
+# Markdown is rendered with cmark-gfm when it is installed; set
+# FILEVIEWER_MARKDOWN=python to keep using Python-Markdown regardless
+USE_CMARK = cmarkgfm is not None and os.environ.get('FILEVIEWER_MARKDOWN', '').lower() != 'python'
+CMARK_EXTENSIONS = ['table', 'autolink', 'strikethrough']
+
+# Python-Markdown converters are costly to build and not thread-safe, so
+# each request thread keeps its own and resets it between documents
+_markdown_local = threading.local()
+
+# Background pool that warms the file cache for /prefetch requests; reads
+# release the GIL, so files load concurrently
+PREFETCH_WORKERS = 32
+PREFETCH_LIMIT = 256
+_prefetch_executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix='prefetch')
+
+# Pool browse-all uses to list sibling folders in parallel; scandir and
+# stat release the GIL, so slow disks overlap
+SCAN_WORKERS = 8
+_scan_executor = ThreadPoolExecutor(max_workers=SCAN_WORKERS, thread_name_prefix='scan')
+
+# File extensions listed by the browse endpoints
+SUPPORTED_EXTENSIONS = frozenset({'.md', '.json', '.yml', '.yaml', '.mmd'})
+
+# Folders browse-all does not descend into
+EXCLUDED_FOLDERS = frozenset({'node_modules', '.git', '__pycache__', '.venv', 'venv', 'dist', 'build'})
+
+# Creation time where the platform records it, else st_ctime
+_get_created = attrgetter('st_birthtime' if hasattr(os.stat_result, 'st_birthtime') else 'st_ctime')
+
+# Responses of these types are gzipped for clients that accept it: buffered
+# ones from this many bytes up, streamed ones (browse-all, large files) as they
+# are written. The SSE stream is text/event-stream and is left alone.
+COMPRESS_MIMETYPES = frozenset({'application/json'})
+COMPRESS_MIN_SIZE = 1024
+COMPRESS_LEVEL = 6
+
+# File payloads whose content is at least this many characters are streamed
+STREAM_RESPONSE_THRESHOLD = 1024 * 1024
+
+
+def find_free_port(start_port: int = 6060, max_attempts: int = 100, sequential: bool = True) -> int:
+    """Find a free port starting from start_port.
+
+    On Linux, ports are probed with SO_REUSEADDR, as the server itself binds
+    them, so a port still in TIME_WAIT from a previous run is reused instead
+    of skipped. Elsewhere the option would let the probe share a port another
+    process is listening on (Windows, or a specific-address listener on
+    macOS/BSD), so a plain bind is used.
+
+    Args:
+        start_port: Preferred port
+        max_attempts: Number of ports to try when scanning upwards
+        sequential: Scan upwards from start_port when it is taken; when False,
+            let the kernel pick any free port instead
+
+    Returns:
+        A port that can be bound
+    """
+    end_port = start_port + max_attempts if sequential else start_port + 1
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        if sys.platform.startswith('linux'):
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        for port in range(start_port, end_port):
+            try:
                 s.bind(('', port))
                 return port
-        except OSError:
-            continue
+            except OSError:
+                continue
+        if not sequential:
+            s.bind(('', 0))
+            return s.getsockname()[1]
     raise RuntimeError(f"Could not find a free port in range {start_port}-{start_port + max_attempts}")
 
 
@@ -42,20 +153,309 @@ def broadcast_change(event_type: str, path: str, project_id: str):
         'project_id': project_id
     }
 
-    # Send to all connected clients
-    dead_queues = []
-    for q in app.config['change_queues']:
-        try:
-            q.put_nowait(message)
-        except queue.Full:
-            dead_queues.append(q)
+    invalidate_file(path)
+
+    # Encode once; every client receives the same SSE frame
+    payload = b'data: ' + fastjson.dumps(message) + b'\n\n'
+
+    # Send to all connected clients; full buffers drop their oldest message
+    with _change_queues_lock:
+        clients = list(app.config['change_queues'].values())
+    for buffer, wakeup in clients:
+        buffer.append(payload)
+        wakeup.set()
+
+
+def render_markdown(content: str) -> str:
+    """Convert markdown to HTML with cmark-gfm or this thread's cached converter."""
+    if USE_CMARK:
+        # Raw HTML is passed through, as Python-Markdown does
+        return cmarkgfm.markdown_to_html_with_extensions(
+            content,
+            options=cmarkgfmOptions.CMARK_OPT_UNSAFE,
+            extensions=CMARK_EXTENSIONS
+        )
+
+    md = getattr(_markdown_local, 'md', None)
+    if md is None:
+        md = _markdown_local.md = markdown.Markdown(extensions=['fenced_code', 'tables'])
+    return md.reset().convert(content)
+
+
+def parse_file(file_path: str):
+    """Parse a file into its tree, raw content, rendered HTML and JSON body.
+
+    Returns:
+        Tuple of (tree, content, html, body). html is None for non-markdown
+        files; body is the encoded get_file_tree response, or None when the
+        file is large enough to be streamed instead
+    """
+    parser = FileParser(file_path)
+    tree = parser.parse()
+    content = parser.get_raw_content()
+
+    # Convert markdown to HTML if it's a markdown file
+    html_content = None
+    if file_path.endswith('.md'):
+        html_content = render_markdown(content)
+
+    body = None
+    if len(content) < STREAM_RESPONSE_THRESHOLD:
+        body = fastjson.dumps({
+            'tree': tree,
+            'content': content,
+            'html': html_content,
+            'type': Path(file_path).suffix.lower()
+        })
+
+    return tree, content, html_content, body
+
+
+def load_file(file_path: str):
+    """Parse a file, reusing the cached result while it is unchanged on disk.
+
+    Entries are keyed by path and validated against the file's mtime and size,
+    so an edit is picked up even if its watcher event has not arrived yet.
+    Results too large to encode up front (body is None) are not cached.
 
-    # Remove dead queues
-    for q in dead_queues:
-        app.config['change_queues'].remove(q)
+    Returns:
+        Tuple of (tree, content, html, body) as returned by parse_file
+    """
+    global _file_cache_bytes
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return parse_file(file_path)
+
+    version = (stat.st_mtime_ns, stat.st_size)
+    cache = app.config['file_cache']
+
+    with _file_cache_lock:
+        entry = cache.get(file_path)
+        if entry is not None and entry[0] == version:
+            cache.move_to_end(file_path)
+            return entry[1]
+
+    result = parse_file(file_path)
+    body = result[3]
+    if body is None or len(body) > FILE_CACHE_BYTES:
+        invalidate_file(file_path)
+        return result
+
+    with _file_cache_lock:
+        old = cache.pop(file_path, None)
+        if old is not None:
+            _file_cache_bytes -= len(old[1][3])
+        cache[file_path] = (version, result)
+        _file_cache_bytes += len(body)
+        while len(cache) > FILE_CACHE_SIZE or _file_cache_bytes > FILE_CACHE_BYTES:
+            _, (_, evicted) = cache.popitem(last=False)
+            _file_cache_bytes -= len(evicted[3])
+
+    return result
+
+
+def invalidate_file(path: str):
+    """Drop a file's cached parse result."""
+    global _file_cache_bytes
+    with _file_cache_lock:
+        entry = app.config['file_cache'].pop(path, None)
+        if entry is not None:
+            _file_cache_bytes -= len(entry[1][3])
+
+
+def stream_file_payload(tree, content: str, html_content, file_type: str):
+    """Yield the get_file_tree JSON body piece by piece.
+
+    Top-level tree nodes are encoded one at a time, so a large document is
+    never serialized into a single response buffer.
+    """
+    yield b'{"tree":['
+    for i, node in enumerate(tree):
+        if i:
+            yield b','
+        yield fastjson.dumps(node)
+    yield b'],"content":'
+    yield fastjson.dumps(content)
+    yield b',"html":'
+    yield fastjson.dumps(html_content)
+    yield b',"type":'
+    yield fastjson.dumps(file_type)
+    yield b'}'
+
+
+def scan_directory(folder_path: str, excluded_folders: Collection[str] = ()) -> List[Dict[str, Any]]:
+    """List the supported files and visible subfolders of a directory.
+
+    Where the platform allows it, the directory is opened once and its entries
+    are stat'ed relative to that descriptor, so the kernel resolves each file
+    name from the open directory rather than walking the full path again.
+
+    Args:
+        folder_path: Directory to list
+        excluded_folders: Folder names to leave out
+
+    Returns:
+        Folder items sorted by name, followed by file items newest first
+    """
+    # (sort key, item) pairs, so each key is computed once per entry
+    folders = []
+    files = []
+
+    dir_fd = None
+    if os.scandir in os.supports_fd:
+        dir_fd = os.open(folder_path, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+
+    try:
+        with os.scandir(folder_path if dir_fd is None else dir_fd) as entries:
+            for entry in entries:
+                name = entry.name
+                dot = name.rfind('.')
+                extension = name[dot:].lower() if dot > 0 else ''
+
+                # Rule entries out by name before asking for their type;
+                # hidden and excluded folders are never listed
+                listable_folder = not name.startswith('.') and name not in excluded_folders
+                supported_file = extension in SUPPORTED_EXTENSIONS
+                if not (listable_folder or supported_file):
+                    continue
+
+                # is_dir/is_file come from the directory read (d_type) where
+                # the platform provides it
+                try:
+                    is_dir = entry.is_dir()
+                    is_file = not is_dir and supported_file and entry.is_file()
+                except OSError:
+                    continue
+
+                if is_dir:
+                    if listable_folder:
+                        folders.append((name.lower(), {
+                            'name': name,
+                            'path': os.path.join(folder_path, name),
+                            'type': 'folder',
+                        }))
+                elif is_file:
+                    stat = entry.stat()
+                    created = _get_created(stat)
+                    files.append((created, {
+                        'name': name,
+                        'path': os.path.join(folder_path, name),
+                        'type': 'file',
+                        'extension': extension,
+                        'modified': stat.st_mtime,
+                        'created': created,
+                    }))
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+
+    # Sort: folders alphabetically, then files by creation date (newest first)
+    folders.sort(key=itemgetter(0))
+    files.sort(key=itemgetter(0), reverse=True)
 
+    return [item for _, item in folders] + [item for _, item in files]
 
 
+def scan_folder_or_empty(folder_path: str) -> List[Dict]:
+    """List a folder for browse-all, skipping excluded folders.
+
+    Args:
+        folder_path: Directory to list
+
+    Returns:
+        The folder's items, or an empty list if it can't be read
+    """
+    try:
+        return scan_directory(folder_path, EXCLUDED_FOLDERS)
+    except (PermissionError, OSError) as e:
+        print(f"Warning: Could not access {folder_path}: {e}")
+        return []
+
+
+def stream_folder_tree(root_path: str):
+    """Yield the browse-all JSON body one folder at a time.
+
+    Folders are listed on the scan pool, breadth-first, and each listing is
+    written out as soon as it completes, so the whole tree is never held in
+    memory. The body has the same {"cache", "rootItems"} shape as before.
+    """
+    root_items = []
+    pending = {_scan_executor.submit(scan_folder_or_empty, root_path): root_path}
+    try:
+        yield b'{"cache":{'
+        first = True
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                folder_path = pending.pop(future)
+                items = future.result()
+                if folder_path == root_path:
+                    root_items = items
+                for item in items:
+                    if item['type'] == 'folder':
+                        pending[_scan_executor.submit(scan_folder_or_empty, item['path'])] = item['path']
+
+                yield (b'' if first else b',') + fastjson.dumps(folder_path) + b':' + fastjson.dumps(items)
+                first = False
+        yield b'},"rootItems":' + fastjson.dumps(root_items) + b'}'
+    finally:
+        # Client went away mid-walk; drop listings that haven't started
+        for future in pending:
+            future.cancel()
+
+
+def gzip_stream(chunks: Iterable) -> Iterator[bytes]:
+    """Gzip a streamed response body chunk by chunk.
+
+    Args:
+        chunks: The response's original body iterable
+
+    Yields:
+        Compressed data as it becomes available
+    """
+    compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, 31)  # 31: gzip container
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+    finally:
+        # Closing the original runs stream_with_context's cleanup
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+
+@app.after_request
+def compress_response(response: Response) -> Response:
+    """Gzip JSON responses when the client accepts gzip."""
+    if (response.direct_passthrough
+            or response.mimetype not in COMPRESS_MIMETYPES
+            or 'Content-Encoding' in response.headers):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    if 'gzip' not in request.headers.get('Accept-Encoding', '').lower():
+        return response
+
+    if response.is_streamed:
+        response.response = gzip_stream(response.response)
+        response.headers.pop('Content-Length', None)
+        response.headers['Content-Encoding'] = 'gzip'
+        return response
+
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_SIZE:
+        return response
+
+    response.set_data(gzip.compress(data, compresslevel=COMPRESS_LEVEL))
+    response.headers['Content-Encoding'] = 'gzip'
+    return response
+
 
 @app.route('/')
 def index():
@@ -80,14 +480,12 @@ def index():
 def get_projects():
     """Get list of all projects."""
     pm = app.config['project_manager']
-    projects = [p.to_dict() for p in pm.get_all_projects()]
-    return jsonify(projects)
+    return jsonify(pm.get_project_dicts())
 
 
 @app.route('/api/projects', methods=['POST'])
 def add_project():
     """Add a new project."""
-    from flask import request
     data = request.json
     folder_path = data.get('path')
     title = data.get('title')
@@ -141,9 +539,9 @@ def remove_project(project_id):
 
     if pm.remove_project(project_id):
         # Stop watching the folder
-        if project_id in app.config['watchers']:
-            app.config['watchers'][project_id].stop()
-            del app.config['watchers'][project_id]
+        watcher = app.config['watchers'].pop(project_id, None)
+        if watcher:
+            watcher.stop()
 
         return jsonify({'success': True})
 
@@ -156,135 +554,102 @@ def browse_all_folders(project_identifier):
     pm = app.config['project_manager']
 
     # Try to get project by ID or slug
-    project = pm.get_project(project_identifier)
-    if not project:
-        project = pm.get_project_by_slug(project_identifier)
+    project = pm.get_project_any(project_identifier)
 
     if not project:
         return jsonify({'error': 'Project not found'}), 404
 
-    root_path = Path(project.path)
-    excluded_folders = {'node_modules', '.git', '__pycache__', '.venv', 'venv', 'dist', 'build'}
+    root_path = os.path.abspath(project.path)
 
-    try:
-        cache = {}
+    return Response(
+        stream_with_context(stream_folder_tree(root_path)),
+        mimetype='application/json'
+    )
 
-        def scan_folder(folder_path: Path):
-            """Recursively scan a folder and its subfolders."""
-            items = []
 
-            try:
-                for item in folder_path.iterdir():
-                    # Skip excluded folders
-                    if item.is_dir() and item.name in excluded_folders:
-                        continue
-
-                    if item.is_file():
-                        # Only include supported file types
-                        if item.suffix.lower() in ['.md', '.json', '.yml', '.yaml', '.mmd']:
-                            stat = item.stat()
-                            items.append({
-                                'name': item.name,
-                                'path': str(item),
-                                'type': 'file',
-                                'extension': item.suffix.lower(),
-                                'modified': stat.st_mtime,
-                                'created': stat.st_birthtime if hasattr(stat, 'st_birthtime') else stat.st_ctime,
-                            })
-                    elif item.is_dir() and not item.name.startswith('.'):
-                        items.append({
-                            'name': item.name,
-                            'path': str(item),
-                            'type': 'folder',
-                        })
-                        # Recursively scan subfolder
-                        scan_folder(item)
-            except (PermissionError, OSError) as e:
-                print(f"Warning: Could not access {folder_path}: {e}")
+@app.route('/api/projects/<project_identifier>/browse')
+@app.route('/api/projects/<project_identifier>/browse/<path:subpath>')
+def browse_project(project_identifier, subpath=''):
+    """Get directory structure for a project."""
+    pm = app.config['project_manager']
 
-            # Sort: folders alphabetically, then files by creation date (newest first)
-            folders = sorted([i for i in items if i['type'] == 'folder'], key=lambda x: x['name'].lower())
-            files = sorted([i for i in items if i['type'] == 'file'], key=lambda x: x['created'], reverse=True)
+    # Try to get project by ID or slug
+    project = pm.get_project_any(project_identifier)
 
-            cache[str(folder_path)] = folders + files
+    if not project:
+        return jsonify({'error': 'Project not found'}), 404
 
-        # Start recursive scan from root
-        scan_folder(root_path)
+    root_path = os.path.abspath(project.path)
+    folder_path = os.path.join(root_path, subpath) if subpath else root_path
 
-        return jsonify({
-            'cache': cache,
-            'rootItems': cache.get(str(root_path), [])
-        })
+    try:
+        return jsonify({'items': scan_directory(folder_path)})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/api/projects/<project_identifier>/browse')
-@app.route('/api/projects/<project_identifier>/browse/<path:subpath>')
-def browse_project(project_identifier, subpath=''):
-    """Get directory structure for a project."""
+@app.route('/api/projects/<project_identifier>/prefetch', methods=['POST'])
+def prefetch_files(project_identifier):
+    """Warm the file cache for files the client is likely to open next."""
     pm = app.config['project_manager']
 
     # Try to get project by ID or slug
-    project = pm.get_project(project_identifier)
-    if not project:
-        project = pm.get_project_by_slug(project_identifier)
+    project = pm.get_project_any(project_identifier)
 
     if not project:
         return jsonify({'error': 'Project not found'}), 404
 
-    folder_path = Path(project.path) / subpath if subpath else Path(project.path)
+    body = request.json or {}
+    if not isinstance(body, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
 
-    try:
-        items = []
-
-        for item in folder_path.iterdir():
-            if item.is_file():
-                # Only include supported file types
-                if item.suffix.lower() in ['.md', '.json', '.yml', '.yaml', '.mmd']:
-                    stat = item.stat()
-                    items.append({
-                        'name': item.name,
-                        'path': str(item),
-                        'type': 'file',
-                        'extension': item.suffix.lower(),
-                        'modified': stat.st_mtime,
-                        'created': stat.st_birthtime if hasattr(stat, 'st_birthtime') else stat.st_ctime,
-                    })
-            elif item.is_dir() and not item.name.startswith('.'):
-                items.append({
-                    'name': item.name,
-                    'path': str(item),
-                    'type': 'folder',
-                })
-
-        # Sort: folders alphabetically, then files by creation date (newest first)
-        folders = sorted([i for i in items if i['type'] == 'folder'], key=lambda x: x['name'].lower())
-        files = sorted([i for i in items if i['type'] == 'file'], key=lambda x: x['created'], reverse=True)
-
-        return jsonify({'items': folders + files})
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    paths = body.get('paths') or []
+    if not isinstance(paths, list):
+        return jsonify({'error': 'paths must be a list'}), 400
+
+    # Only files inside this project are loaded
+    root = os.path.normpath(project.path)
+    queued = []
+    for path in paths[:PREFETCH_LIMIT]:
+        if not isinstance(path, str) or not os.path.isabs(path):
+            continue
+        path = os.path.normpath(path)
+        if os.path.commonpath([root, path]) == root and path not in queued:
+            queued.append(path)
+
+    for path in queued:
+        _prefetch_executor.submit(load_file, path)
+
+    return jsonify({'success': True, 'queued': len(queued)}), 202
 
 
 @app.route('/api/events')
 def stream_events():
     """Server-Sent Events endpoint for file change notifications."""
     def event_stream():
-        q = queue.Queue(maxsize=10)
-        app.config['change_queues'].append(q)
+        client = (deque(maxlen=SSE_BUFFER_SIZE), threading.Event())
+        buffer, wakeup = client
+        token = id(client)
+        with _change_queues_lock:
+            app.config['change_queues'][token] = client
 
         try:
             while True:
-                try:
-                    message = q.get(timeout=30)  # 30 second timeout for heartbeat
-                    yield f"data: {json.dumps(message)}\n\n"
-                except queue.Empty:
+                if not wakeup.wait(timeout=30):  # 30 second timeout for heartbeat
                     # Send heartbeat
-                    yield f": heartbeat\n\n"
+                    yield b': heartbeat\n\n'
+                    continue
+
+                wakeup.clear()
+                # Send everything that arrived since the last wakeup in one write
+                messages = []
+                while buffer:
+                    messages.append(buffer.popleft())
+                if messages:
+                    yield b''.join(messages)
         finally:
-            if q in app.config['change_queues']:
-                app.config['change_queues'].remove(q)
+            with _change_queues_lock:
+                app.config['change_queues'].pop(token, None)
 
     return Response(
         stream_with_context(event_stream()),
@@ -303,30 +668,21 @@ def get_file_tree(file_path):
 
     # Check if file is in a watched project
     pm = app.config['project_manager']
-    is_watched = any(
-        file_path.startswith(project.path)
-        for project in pm.get_all_projects()
-    )
-    if not is_watched:
+    if not pm.is_watched(file_path):
         return jsonify({'error': 'File not in watched project'}), 403
 
     try:
-        parser = FileParser(file_path)
-        tree = parser.parse()
-        content = parser.get_raw_content()
+        tree, content, html_content, body = load_file(file_path)
 
-        # Convert markdown to HTML if it's a markdown file
-        html_content = None
-        if file_path.endswith('.md'):
-            md = markdown.Markdown(extensions=['fenced_code', 'tables'])
-            html_content = md.convert(content)
+        if body is None:
+            file_type = Path(file_path).suffix.lower()
+            return Response(
+                stream_with_context(stream_file_payload(tree, content, html_content, file_type)),
+                mimetype='application/json'
+            )
 
-        return jsonify({
-            'tree': tree,
-            'content': content,
-            'html': html_content,
-            'type': Path(file_path).suffix.lower()
-        })
+        # Cache hits send the already-encoded body
+        return Response(body, mimetype='application/json')
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -376,6 +732,9 @@ def main():
         # Stop all watchers
         for watcher in app.config['watchers'].values():
             watcher.stop()
+        stop_observer()
+        # Don't lose a change made just before shutdown
+        pm.flush()
 
 
 if __name__ == '__main__':
@@ -1,5 +1,6 @@
 """File system watcher for monitoring folder changes."""
 
+import os
 import threading
 from pathlib import Path
 from typing import Callable, Optional
@@ -7,17 +8,67 @@ from typing import Callable, Optional
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler, FileSystemEvent
 
+# File types whose changes are reported
+_SUPPORTED_EXTS = ('.md', '.json', '.yml', '.yaml', '.mmd')
+
+# Paths inside these folders (VCS, dependencies, build output) are ignored
+_EXCLUDED_SEGMENTS = tuple(
+    f'{os.sep}{name}{os.sep}'
+    for name in ('.git', 'node_modules', '__pycache__', '.venv', 'venv', 'dist', 'build')
+)
+
+# Access-only events; watchdog reports them, but nothing on disk changed
+_IGNORED_EVENT_TYPES = frozenset({'opened', 'closed_no_write'})
+
+# Seconds to gather events before delivering them; repeats of the same event
+# type for the same path within the window (e.g. an editor's atomic save)
+# are delivered once
+COALESCE_DELAY = 0.05
+
+# One observer thread serves every FolderWatcher; it is started on first use
+_observer: Optional[Observer] = None
+_observer_lock = threading.Lock()
+# Number of FolderWatchers using each scheduled watch, so a folder shared by
+# two projects stays watched until both stop
+_watch_users = {}
+
+
+def _get_observer() -> Observer:
+    """Return the shared observer, starting it if needed."""
+    global _observer
+    if _observer is None:
+        _observer = Observer()
+        _observer.daemon = True
+        _observer.start()
+    return _observer
+
+
+def stop_observer():
+    """Stop the shared observer thread, if it was started."""
+    global _observer
+    with _observer_lock:
+        observer, _observer = _observer, None
+        _watch_users.clear()
+    if observer is not None:
+        observer.stop()
+        observer.join()
+
 
 class FolderEventHandler(FileSystemEventHandler):
     """Handler for file system events."""
 
-    def __init__(self, callback: Optional[Callable] = None):
+    def __init__(self, callback: Optional[Callable] = None, root: str = ''):
         """Initialize the event handler.
 
         Args:
             callback: Optional callback function to call on file changes
+            root: Watched folder; excluded folders are only matched below it
         """
         self.callback = callback
+        self._root_len = len(root)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
         super().__init__()
 
     def on_any_event(self, event: FileSystemEvent):
@@ -26,17 +77,35 @@ class FolderEventHandler(FileSystemEventHandler):
         Args:
             event: The file system event
         """
-        # Process both files and directories
-        is_relevant = False
+        if event.event_type in _IGNORED_EVENT_TYPES:
+            return
+
+        path = event.src_path
+        # The trailing separator lets an excluded folder's own events match too
+        relative = path[self._root_len:] + os.sep
+        if any(segment in relative for segment in _EXCLUDED_SEGMENTS):
+            return
 
-        if event.is_directory:
-            # Always notify about directory changes
-            is_relevant = True
-        else:
-            # Only process supported file types
-            is_relevant = event.src_path.endswith(('.md', '.json', '.yml', '.yaml'))
+        # Always notify about directory changes; files only for supported types
+        is_relevant = event.is_directory or path.endswith(_SUPPORTED_EXTS)
 
         if is_relevant:
+            with self._lock:
+                # A repeat replaces the pending event but keeps its place
+                self._pending[(event.event_type, path)] = event
+                if self._timer is None:
+                    self._timer = threading.Timer(COALESCE_DELAY, self._flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+
+    def _flush(self):
+        """Deliver the events gathered since the timer was started."""
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            self._timer = None
+
+        for event in pending.values():
             print(f"{'Folder' if event.is_directory else 'File'} change detected: {event.event_type} - {event.src_path}")
             if self.callback:
                 self.callback(event)
@@ -54,27 +123,34 @@ class FolderWatcher:
         """
         self.folder_path = Path(folder_path)
         self.callback = callback
-        self.observer = Observer()
-        self.event_handler = FolderEventHandler(callback)
+        self.event_handler = FolderEventHandler(callback, str(self.folder_path))
+        self._watch = None
         self._running = False
 
     def start(self):
         """Start watching the folder."""
         if not self._running:
-            self.observer.schedule(
-                self.event_handler,
-                str(self.folder_path),
-                recursive=True
-            )
-            self.observer.start()
+            with _observer_lock:
+                self._watch = _get_observer().schedule(
+                    self.event_handler,
+                    str(self.folder_path),
+                    recursive=True
+                )
+                _watch_users[self._watch] = _watch_users.get(self._watch, 0) + 1
             self._running = True
             print(f"Started watching: {self.folder_path}")
 
     def stop(self):
         """Stop watching the folder."""
         if self._running:
-            self.observer.stop()
-            self.observer.join()
+            with _observer_lock:
+                if _observer is not None:
+                    _observer.remove_handler_for_watch(self.event_handler, self._watch)
+                    _watch_users[self._watch] -= 1
+                    if not _watch_users[self._watch]:
+                        del _watch_users[self._watch]
+                        _observer.unschedule(self._watch)
+            self._watch = None
             self._running = False
             print(f"Stopped watching: {self.folder_path}")
 